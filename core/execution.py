@@ -0,0 +1,197 @@
+import time
+import queue
+import logging
+import threading
+from collections import namedtuple, deque
+
+MAGIC_NUMBER = 202403
+
+# The MetaTrader5 module is process-global and not thread-safe; every broker call in the process holds this
+BROKER_LOCK = threading.RLock()
+
+SymbolMeta = namedtuple('SymbolMeta', ['point', 'digits', 'volume_step', 'volume_min', 'volume_max'])
+
+class ExecutionEngine:
+    """
+    Sends orders off the analysis thread. Decisions are queued and a single execution thread turns
+    them into market orders using per-session cached symbol metadata, one tick snapshot per decision
+    and the ATR already computed during analysis. Requotes are retried a bounded number of times and
+    every fill is measured for signal-to-fill latency and slippage. The broker is injectable so the
+    whole path can run against core.sim_broker.SimulatedBroker. Broker calls hold `broker_lock`,
+    the process-wide BROKER_LOCK.
+    """
+    def __init__(self, config, broker=None, on_fill=None, guard=None):
+        if broker is None:
+            # Imported here so the engine can run against a simulated broker without the MT5 package
+            import MetaTrader5 as broker
+        self.config = config
+        self.ai_name = config["system_identity"]["name"]
+        self.broker = broker
+        self.on_fill = on_fill
+        self.guard = guard
+        settings = config.get('execution', {})
+        self.max_retries = settings.get('max_retries', 3)
+        self.retry_delay = settings.get('retry_delay_seconds', 0.25)
+        self.deviation = settings.get('deviation_points', 20)
+        self.retry_retcodes = {broker.TRADE_RETCODE_REQUOTE, broker.TRADE_RETCODE_PRICE_CHANGED, broker.TRADE_RETCODE_PRICE_OFF}
+
+        self.broker_lock = BROKER_LOCK
+        self._symbol_meta = {}
+        self._orders = queue.Queue(maxsize=settings.get('queue_size', 100))
+        self._thread = None
+        # Session totals are running aggregates; only the recent window is kept for percentiles
+        self.reports = deque(maxlen=settings.get('report_window', 500))
+        self._totals = {'fills': 0, 'latency_ms': 0.0, 'slippage_points': 0.0, 'max_slippage_points': None, 'requoted_fills': 0}
+
+    # --- Session metadata ---
+
+    def get_symbol_meta(self, symbol):
+        """Returns point/digits/volume limits for a symbol, querying the broker only once per session."""
+        meta = self._symbol_meta.get(symbol)
+        if meta is None:
+            with self.broker_lock:
+                info = self.broker.symbol_info(symbol)
+            if info is None:
+                raise ValueError(f"Symbol info unavailable for {symbol}")
+            meta = SymbolMeta(info.point, info.digits, info.volume_step, info.volume_min, info.volume_max)
+            self._symbol_meta[symbol] = meta
+        return meta
+
+    def invalidate_symbol_meta(self):
+        """Drops the cached metadata, e.g. after reconnecting to a different server."""
+        self._symbol_meta.clear()
+
+    # --- Async submission ---
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"{self.ai_name}-execution", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10):
+        if self._thread is not None and self._thread.is_alive():
+            self._orders.put(None)
+            self._thread.join(timeout=timeout)
+
+    def submit(self, decision):
+        """Queues a decision for execution without blocking. Returns False if the queue is full."""
+        decision.setdefault('signal_time', time.time())
+        try:
+            self._orders.put_nowait(decision)
+            return True
+        except queue.Full:
+            logging.error(f"Execution queue full, dropping {decision['signal']} signal for {decision['symbol']}.")
+            return False
+
+    def _run(self):
+        while True:
+            decision = self._orders.get()
+            if decision is None:
+                return
+            try:
+                self.execute(decision)
+            except Exception as e:
+                logging.critical(f"UNHANDLED EXCEPTION while executing {decision['symbol']}: {e}", exc_info=True)
+
+    # --- Order path ---
+
+    def execute(self, decision):
+        """Sends one market order for a decision, retrying on requotes. Returns the execution report or None."""
+        symbol, signal = decision['symbol'], decision['signal']
+        signal_time = decision.get('signal_time', time.time())
+        if self.guard is not None:
+            with self.broker_lock:
+                allowed = self.guard(symbol)
+            if not allowed:
+                return None
+
+        meta = self.get_symbol_meta(symbol)
+        with self.broker_lock:
+            tick = self.broker.symbol_info_tick(symbol)
+        requested_price = tick.ask if signal == "BUY" else tick.bid
+
+        for attempt in range(self.max_retries + 1):
+            request = self._build_request(decision, meta, tick)
+            with self.broker_lock:
+                result = self.broker.order_send(request)
+                error = self.broker.last_error() if result is None else None
+            if result is None:
+                logging.error(f"ORDER SEND FAILED for {symbol}: no response ({error})")
+                return None
+            if result.retcode == self.broker.TRADE_RETCODE_DONE:
+                return self._record_fill(decision, meta, request, result, requested_price, signal_time, attempt)
+            if result.retcode not in self.retry_retcodes or attempt == self.max_retries:
+                logging.error(f"ORDER SEND FAILED for {symbol}: {result.comment} (retcode {result.retcode}, attempt {attempt + 1})")
+                return None
+
+            logging.warning(f"Requote for {symbol} ({result.comment}). Retrying with a fresh tick ({attempt + 1}/{self.max_retries})...")
+            time.sleep(self.retry_delay)
+            with self.broker_lock:
+                tick = self.broker.symbol_info_tick(symbol)
+
+    def _build_request(self, decision, meta, tick):
+        risk = self.config['dynamic_risk_management']
+        signal, atr = decision['signal'], decision['atr']
+        point = meta.point
+
+        sl_points = int((atr * risk['sl_atr_multiplier']) / point)
+        tp_points = int((atr * risk['tp_atr_multiplier']) / point)
+
+        price = tick.ask if signal == "BUY" else tick.bid
+        sl = price - sl_points * point if signal == "BUY" else price + sl_points * point
+        tp = price + tp_points * point if signal == "BUY" else price - tp_points * point
+
+        return {
+            "action": self.broker.TRADE_ACTION_DEAL, "symbol": decision['symbol'], "volume": self._normalize_volume(meta),
+            "type": self.broker.ORDER_TYPE_BUY if signal == "BUY" else self.broker.ORDER_TYPE_SELL,
+            "price": price, "sl": round(sl, meta.digits), "tp": round(tp, meta.digits), "deviation": self.deviation,
+            "magic": MAGIC_NUMBER, "comment": f"{self.ai_name} {signal} {decision['confidence']:.2f}",
+            "type_time": self.broker.ORDER_TIME_GTC, "type_filling": self.broker.ORDER_FILLING_IOC,
+        }
+
+    def _normalize_volume(self, meta):
+        lot_size = self.config['trading_parameters'].get('lot_size', meta.volume_min)
+        steps = round(lot_size / meta.volume_step)
+        return round(min(max(steps * meta.volume_step, meta.volume_min), meta.volume_max), 8)
+
+    def _record_fill(self, decision, meta, request, result, requested_price, signal_time, retries):
+        symbol, signal = decision['symbol'], decision['signal']
+        fill_price = result.price or request['price']
+        # Positive slippage is adverse: paid more on a BUY, received less on a SELL
+        slippage = (fill_price - requested_price) if signal == "BUY" else (requested_price - fill_price)
+        report = {
+            'ticket': result.order,
+            'requested_price': requested_price,
+            'fill_price': fill_price,
+            'slippage_points': round(slippage / meta.point, 1),
+            'latency_ms': round((time.time() - signal_time) * 1000, 1),
+            'retries': retries,
+        }
+        self.reports.append(report)
+        totals = self._totals
+        totals['fills'] += 1
+        totals['latency_ms'] += report['latency_ms']
+        totals['slippage_points'] += report['slippage_points']
+        if totals['max_slippage_points'] is None or report['slippage_points'] > totals['max_slippage_points']:
+            totals['max_slippage_points'] = report['slippage_points']
+        totals['requoted_fills'] += retries > 0
+        logging.info(f"ORDER SENT for {symbol} {signal} @ {fill_price}. Ticket: {result.order}. "
+                     f"Latency {report['latency_ms']} ms, slippage {report['slippage_points']} pts, retries {retries}.")
+        if self.on_fill is not None:
+            self.on_fill(decision, report)
+        return report
+
+    def stats(self):
+        """Summarizes signal-to-fill latency and slippage over the session's fills; p95 covers the recent window."""
+        totals = self._totals
+        if not totals['fills']:
+            return {'fills': 0}
+        latencies = sorted(r['latency_ms'] for r in self.reports)
+        return {
+            'fills': totals['fills'],
+            'avg_latency_ms': round(totals['latency_ms'] / totals['fills'], 1),
+            'p95_latency_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'avg_slippage_points': round(totals['slippage_points'] / totals['fills'], 2),
+            'max_slippage_points': totals['max_slippage_points'],
+            'requoted_fills': totals['requoted_fills'],
+        }
@@ -0,0 +1,187 @@
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+from datetime import datetime
+
+from modules.log_levels import HOT_PATH
+
+DECISION_LOGGER = 'seraph.decisions'
+LOG_FORMAT = '%(asctime)s - [%(name)s] - %(levelname)s - %(message)s'
+
+class SamplingFilter(logging.Filter):
+    """Lets through one in every `every` HOT_PATH records per call site. Other levels always pass."""
+    def __init__(self, every):
+        super().__init__()
+        self.every = every
+        self._counts = {}
+
+    def filter(self, record):
+        if record.levelno != HOT_PATH:
+            return True
+        if self.every <= 0:
+            return False
+        key = (record.pathname, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+class LogIOTimer:
+    """Accumulates the time each thread spends inside log handlers, so sync and queue modes can be compared."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def instrument(self, handler):
+        """Wraps handler.handle; records counts one per handler call, charged to the calling thread."""
+        handle = handler.handle
+        def timed_handle(record):
+            start = time.perf_counter()
+            try:
+                return handle(record)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    seconds, records = self._totals.get(threading.get_ident(), (0.0, 0))
+                    self._totals[threading.get_ident()] = (seconds + elapsed, records + 1)
+        handler.handle = timed_handle
+        return handler
+
+    def reset(self):
+        """Returns the calling thread's (milliseconds, record count) since the last reset, and clears every thread's totals."""
+        with self._lock:
+            seconds, records = self._totals.get(threading.get_ident(), (0.0, 0))
+            self._totals.clear()
+        return seconds * 1000, records
+
+LOG_IO_TIMER = LogIOTimer()
+
+class _WorkerTag(logging.Filter):
+    def __init__(self, worker_id):
+        super().__init__()
+        self.name_tag = f"worker-{worker_id}"
+
+    def filter(self, record):
+        if record.name == 'root':
+            record.name = self.name_tag
+        return True
+
+class RecordForwarder(logging.Handler):
+    """Re-dispatches records received from worker processes to the matching local logger."""
+    def handle(self, record):
+        logging.getLogger(record.name).handle(record)
+        return True
+
+def _quiet_libraries():
+    # Set higher logging level for verbose libraries
+    logging.getLogger('urllib3').setLevel(logging.WARNING)
+    logging.getLogger('tensorflow').setLevel(logging.ERROR)
+
+def _start_listener(handlers):
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return logging.handlers.QueueHandler(log_queue)
+
+def setup_logging(config):
+    """
+    Configures the central logger for the application. In 'sync' mode handlers write on the calling
+    thread; in 'queue' mode the calling thread only enqueues records and a background listener
+    writes them to a size-rotated file and stdout. Decision records always go to a separate JSONL stream.
+    """
+    settings = config.get('logging', {})
+    mode = settings.get('mode', 'sync')
+    sample_every = settings.get('hot_path_sample_every', 0)
+    level = HOT_PATH if sample_every > 0 else logging.INFO
+    sampler = SamplingFilter(sample_every)
+    formatter = logging.Formatter(LOG_FORMAT)
+    max_bytes = settings.get('max_bytes', 10 * 1024 * 1024)
+    backup_count = settings.get('backup_count', 5)
+
+    # Sampling sits on the root logger so it runs once per record, not once per handler.
+    # Records forwarded from workers enter through their own logger and were sampled in the worker.
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for existing in list(root.filters):
+        root.removeFilter(existing)
+    root.addFilter(sampler)
+
+    if mode == 'queue':
+        file_handler = logging.handlers.RotatingFileHandler(config["system_files"]["log_file"], maxBytes=max_bytes, backupCount=backup_count)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+        handlers = [_start_listener([file_handler, stream_handler])]
+    else:
+        handlers = [logging.FileHandler(config["system_files"]["log_file"]), logging.StreamHandler(sys.stdout)]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+    for handler in handlers:
+        root.addHandler(LOG_IO_TIMER.instrument(handler))
+
+    # Compact, machine-readable decision stream kept out of the human log
+    decision_logger = logging.getLogger(DECISION_LOGGER)
+    decision_logger.propagate = False
+    decision_logger.setLevel(logging.INFO)
+    for handler in list(decision_logger.handlers):
+        decision_logger.removeHandler(handler)
+    decision_file = settings.get('decision_log_file', 'seraph_decisions.jsonl')
+    decision_handler = logging.handlers.RotatingFileHandler(decision_file, maxBytes=max_bytes, backupCount=backup_count)
+    decision_handler.setFormatter(logging.Formatter('%(message)s'))
+    if mode == 'queue':
+        decision_handler = _start_listener([decision_handler])
+    decision_logger.addHandler(LOG_IO_TIMER.instrument(decision_handler))
+
+    _quiet_libraries()
+
+def configure_worker_logging(config, worker_id, log_queue):
+    """Routes a worker process's records to the supervisor, which owns every file handle. `log_queue` only needs put_nowait."""
+    sample_every = config.get('logging', {}).get('hot_path_sample_every', 0)
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(_WorkerTag(worker_id))
+
+    root = logging.getLogger()
+    root.setLevel(HOT_PATH if sample_every > 0 else logging.INFO)
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addFilter(SamplingFilter(sample_every))
+    root.addHandler(LOG_IO_TIMER.instrument(handler))
+    _quiet_libraries()
+
+def log_decision(decision, weights):
+    """Appends one compact JSON line describing a synthesized decision to the decision stream."""
+    record = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'symbol': decision['symbol'],
+        'signal': decision['signal'],
+        'confidence': round(decision['confidence'], 4),
+        'scores': {k: round(v, 4) for k, v in decision['scores'].items()},
+        'weights': {k: round(v, 4) for k, v in weights.items()},
+        'latency_ms': round(decision.get('latency_ms', 0.0), 2),
+    }
+    logging.getLogger(DECISION_LOGGER).info(json.dumps(record, separators=(',', ':')))
+
+def read_decisions(path, symbol=None, since=None):
+    """Yields decision records from a JSONL stream, optionally filtered by symbol and ISO timestamp."""
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if symbol is not None and record.get('symbol') != symbol:
+                    continue
+                if since is not None and record.get('ts', '') <= since:
+                    continue
+                yield record
+    except FileNotFoundError:
+        return
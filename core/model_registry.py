@@ -0,0 +1,174 @@
+import os
+import json
+import mmap
+import pickle
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+import tensorflow as tf
+
+class ModelRegistry:
+    """
+    Lazily loads per-symbol Keras models on first use and keeps them under a memory budget.
+    Scalers and feature lists are small and stay resident; the heavy models are evicted in
+    least-recently-used order. Symbols whose model files are byte-identical share one instance;
+    registration only stats the files, and content is hashed on first load when sizes collide.
+    """
+    def __init__(self, config):
+        self.config = config
+        registry_cfg = config.get('model_registry', {})
+        self.memory_budget_bytes = int(registry_cfg.get('memory_budget_mb', 2048) * 1024 * 1024)
+        self.use_mmap = registry_cfg.get('use_mmap', True)
+        # Keras 3 no longer accepts an open h5py.File in load_model, so the mmap path cannot work there
+        keras_major = int(str(getattr(tf.keras, '__version__', '2')).split('.')[0])
+        if self.use_mmap and keras_major >= 3:
+            logging.info(f"Keras {tf.keras.__version__} cannot load models from an h5py handle; memory-mapped loading disabled.")
+            self.use_mmap = False
+        self.model_folder = config['model_architecture']['model_folder']
+        self.timeframe = config['trading_parameters']['timeframe']
+
+        # Resident, cheap metadata: symbol -> scaler / feature list / model file (size, mtime)
+        self.scalers = {}
+        self.feature_columns = {}
+        self.model_paths = {}
+        self.model_keys = {}
+        # symbol -> cache key, resolved on first load
+        self.model_digests = {}
+
+        # LRU cache of loaded models keyed by file path, or by content digest for same-size files
+        self._models = OrderedDict()
+        self._model_sizes = {}
+        self.resident_bytes = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_times = []
+
+    def _base_path(self, symbol):
+        return os.path.join(self.model_folder, f"{symbol}_{self.timeframe}")
+
+    def register_symbols(self, symbols):
+        """Loads the resident metadata for every symbol without touching the models themselves."""
+        logging.info(f"Registering model assets for {len(symbols)} symbols (lazy loading enabled)...")
+        for symbol in symbols:
+            try:
+                self.register_symbol(symbol)
+            except FileNotFoundError:
+                logging.error(f"CRITICAL: Model or assets for {symbol} not found! This symbol will be skipped. Please train first.")
+            except Exception as e:
+                logging.error(f"Error registering assets for {symbol}: {e}")
+
+    def register_symbol(self, symbol):
+        """Reads the scaler and feature list for one symbol; the model file is only stat-ed."""
+        base_path = self._base_path(symbol)
+        model_path = f"{base_path}_model.h5"
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(model_path)
+
+        with open(f"{base_path}_scaler.pkl", 'rb') as f:
+            scaler = pickle.load(f)
+        with open(f"{base_path}_features.json", 'r') as f:
+            features = json.load(f)
+
+        self.scalers[symbol] = scaler
+        self.feature_columns[symbol] = features
+        stat = os.stat(model_path)
+        self.model_paths[symbol] = model_path
+        self.model_keys[symbol] = (stat.st_size, stat.st_mtime_ns)
+        self.model_digests.pop(symbol, None)
+
+    def has_assets(self, symbol):
+        return symbol in self.model_paths
+
+    def get(self, symbol):
+        """Returns (model, scaler, feature_columns) for a symbol, loading the model if needed."""
+        if not self.has_assets(symbol):
+            return None, None, None
+        return self.get_model(symbol), self.scalers[symbol], self.feature_columns[symbol]
+
+    def _cache_key(self, symbol):
+        """Files of a size no other symbol shares cannot be identical, so only same-size files are hashed."""
+        key = self.model_digests.get(symbol)
+        if key is None:
+            path, size = self.model_paths[symbol], self.model_keys[symbol][0]
+            same_size = [s for s, (other, _) in self.model_keys.items() if other == size and self.model_paths[s] != path]
+            key = self._file_digest(path) if same_size else path
+            self.model_digests[symbol] = key
+        return key
+
+    def get_model(self, symbol):
+        digest = self._cache_key(symbol)
+        if digest in self._models:
+            self.hits += 1
+            self._models.move_to_end(digest)
+            return self._models[digest]
+
+        self.misses += 1
+        start = time.perf_counter()
+        model = self._load_model(self.model_paths[symbol])
+        elapsed = time.perf_counter() - start
+        self.load_times.append(elapsed)
+
+        size = self._estimate_size(model)
+        self._evict_until_fits(size)
+        self._models[digest] = model
+        self._model_sizes[digest] = size
+        self.resident_bytes += size
+        logging.info(f"Loaded model for {symbol} in {elapsed * 1000:.0f} ms ({size / 1024 / 1024:.1f} MB).")
+        return model
+
+    def _evict_until_fits(self, size):
+        while self._models and self.resident_bytes + size > self.memory_budget_bytes:
+            digest, _ = self._models.popitem(last=False)
+            self.resident_bytes -= self._model_sizes.pop(digest)
+            self.evictions += 1
+            shared_by = [s for s, d in self.model_digests.items() if d == digest]
+            logging.info(f"Evicted model shared by {shared_by} to stay within the memory budget.")
+
+    def _load_model(self, model_path):
+        """Loads a Keras model, reading the HDF5 file through a memory map when possible."""
+        if self.use_mmap:
+            try:
+                import h5py
+                with open(model_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with h5py.File(mm, 'r') as h5_file:
+                        return tf.keras.models.load_model(h5_file, compile=False)
+            except Exception as e:
+                # Disable for the session so every later cache miss does not retry and warn again
+                logging.warning(f"Memory-mapped load failed for {model_path}; using regular loads for the rest of the session: {e}")
+                self.use_mmap = False
+        return tf.keras.models.load_model(model_path, compile=False)
+
+    @staticmethod
+    def _estimate_size(model):
+        # Weights are float32, so four bytes per parameter
+        return model.count_params() * 4
+
+    @staticmethod
+    def _file_digest(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def stats(self):
+        """Returns hit rate, load latency and memory usage for the dashboard and logs."""
+        lookups = self.hits + self.misses
+        return {
+            'registered_symbols': len(self.model_paths),
+            'unique_models': len(set(self.model_digests.values())),
+            'resident_models': len(self._models),
+            'resident_mb': round(self.resident_bytes / 1024 / 1024, 2),
+            'budget_mb': round(self.memory_budget_bytes / 1024 / 1024, 2),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'avg_load_ms': round(sum(self.load_times) / len(self.load_times) * 1000, 1) if self.load_times else 0.0,
+            'max_load_ms': round(max(self.load_times) * 1000, 1) if self.load_times else 0.0,
+        }
@@ -1,17 +1,14 @@
-import os
-import json
-import pickle
 import logging
 import time
-from datetime import datetime
 import MetaTrader5 as mt5
 import pandas as pd
-import numpy as np
-import tensorflow as tf
 
-from .trade_logger import TradeLogger
-from .evaluator import SeraphEvaluator
-from modules.technical_analyzer import TechnicalAnalyzer
+from .model_registry import ModelRegistry
+from .log_config import HOT_PATH, LOG_IO_TIMER
+from .execution import BROKER_LOCK
+from .order_desk import OrderDesk
+from modules.technical_analyzer import TechnicalAnalyzer, FEATURE_COLUMNS
+from modules.feature_cache import FeatureCache
 from modules.structural_analyzer import StructuralAnalyzer
 from modules.fundamental_analyzer import FundamentalAnalyzer
 
@@ -19,65 +16,86 @@ class SeraphROrchestrator:
     """
     The main decision-making engine of the Seraph-R system.
     It orchestrates the analysis of multiple symbols, synthesizes a final decision with
-    clear reasoning, executes trades, and triggers the self-evaluation loop.
+    clear reasoning, executes trades, and triggers the self-evaluation loop. Analysis-only
+    instances (supervisor workers) pass trade=False and never build the order desk.
     """
-    def __init__(self, config):
+    def __init__(self, config, trade=True):
         self.config = config
         self.ai_name = config["system_identity"]["name"]
         self.is_trading_enabled = False
-        self.trade_counter = 0
 
-        # Initialize Brains and Logger
+        # Initialize Brains
         self.tech_analyzer = TechnicalAnalyzer(config)
+        self.feature_cache = FeatureCache(config, self.tech_analyzer)
         self.struct_analyzer = StructuralAnalyzer(config)
         self.fund_analyzer = FundamentalAnalyzer(config)
-        self.logger = TradeLogger(config)
-        
-        # Placeholders for per-symbol models and scalers
-        self.models = {}
-        self.scalers = {}
-        self.feature_columns = {}
+        # Execution, journal, status and history live with whoever sends the orders
+        self.order_desk = OrderDesk(config) if trade else None
         
+        # Per-symbol models are loaded lazily; scalers and feature lists stay resident
+        self.model_registry = ModelRegistry(config)
+
     def _connect_mt5(self):
         # ... [Same connection logic as Evaluator] ...
         pass
 
     def _load_all_models(self):
-        """Pre-loads all necessary models and scalers into memory for performance."""
-        logging.info("Pre-loading all trained models and scalers...")
-        model_folder = self.config['model_architecture']['model_folder']
-        for symbol in self.config['trading_parameters']['symbols_to_trade']:
-            try:
-                timeframe = self.config['trading_parameters']['timeframe']
-                base_path = os.path.join(model_folder, f"{symbol}_{timeframe}")
-                
-                self.models[symbol] = tf.keras.models.load_model(f"{base_path}_model.h5")
-                with open(f"{base_path}_scaler.pkl", 'rb') as f:
-                    self.scalers[symbol] = pickle.load(f)
-                with open(f"{base_path}_features.json", 'r') as f:
-                    self.feature_columns[symbol] = json.load(f)
-                
-                logging.info(f"Successfully loaded model and assets for {symbol}.")
-            except FileNotFoundError:
-                logging.error(f"CRITICAL: Model or assets for {symbol} not found! This symbol will be skipped. Please train first.")
-            except Exception as e:
-                logging.error(f"Error loading assets for {symbol}: {e}")
-        
+        """Registers every symbol's scaler, feature list and model file; models load on first use."""
+        self.model_registry.register_symbols(self.config['trading_parameters']['symbols_to_trade'])
+
     def get_live_data_for_analysis(self, symbol):
         """Fetches and prepares the latest market data for a given symbol."""
         timeframe = getattr(mt5, self.config['trading_parameters']['timeframe'])
         bars_to_fetch = self.config['model_architecture']['lookback_period'] + 150 # Fetch extra for indicator calculations
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars_to_fetch)
+        with BROKER_LOCK:
+            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars_to_fetch)
         
         if rates is None or len(rates) < bars_to_fetch:
             logging.warning(f"Could not retrieve enough live data for {symbol}.")
             return None
 
         df = pd.DataFrame(rates); df['time'] = pd.to_datetime(df['time'], unit='s'); df.set_index('time', inplace=True)
-        # Apply the exact same feature engineering as the trainer
-        df = self.tech_analyzer.calculate_features(df)
-        df.dropna(inplace=True)
-        return df
+        # Apply the exact same feature engineering as the trainer; only new bars are recomputed
+        feature_columns = self.model_registry.feature_columns.get(symbol, FEATURE_COLUMNS)
+        return self.feature_cache.get_frame(symbol, df, feature_columns)
+
+    def analyze_symbol(self, symbol):
+        """Runs all three brains on one symbol and returns the synthesized decision, or None if data is missing."""
+        logging.log(HOT_PATH, f"--- Analyzing {symbol} ---")
+        started = time.perf_counter()
+        df_live = self.get_live_data_for_analysis(symbol)
+        if df_live is None: return None
+
+        model, scaler, feature_columns = self.model_registry.get(symbol)
+        tech_signal = self.tech_analyzer.analyze(df_live, model, scaler, feature_columns)
+        struct_signal = self.struct_analyzer.analyze(df_live)
+        fund_signal = self.fund_analyzer.get_news_sentiment_for_pair(symbol)
+        
+        scores = {'technical': tech_signal['score'], 'structural': struct_signal['score'], 'fundamental': fund_signal['score']}
+        weights = self.config['strategy_weights']
+        final_confidence = sum(scores[key] * weights[key] for key in scores)
+        
+        reasoning_block = (
+            f"SYNTHESIS FOR {symbol}:\n"
+            f"  [TA]: {tech_signal['narrative']}\n"
+            f"  [SMC]: {struct_signal['narrative']}\n"
+            f"  [FA]: {fund_signal['narrative']}\n"
+            f"  >> FINAL CONFIDENCE: {final_confidence:.3f}"
+        )
+        # Sampled like the rest of the hot path; every decision is already in the JSONL stream
+        logging.log(HOT_PATH, reasoning_block)
+
+        trade_signal = "HOLD"
+        if final_confidence > 0.55: trade_signal = "BUY"
+        elif final_confidence < -0.55: trade_signal = "SELL"
+
+        return {
+            'symbol': symbol, 'signal': trade_signal, 'confidence': float(final_confidence),
+            'scores': {k: float(v) for k, v in scores.items()}, 'reasoning': reasoning_block,
+            'atr': struct_signal['atr'],
+            'signal_time': time.time(),
+            'latency_ms': (time.perf_counter() - started) * 1000,
+        }
 
     def run(self):
         """The main operational loop of the trading bot."""
@@ -85,101 +103,33 @@ class SeraphROrchestrator:
         if not self._connect_mt5(): return
         
         self._load_all_models()
+        self.order_desk.execution.start()
         self.is_trading_enabled = True
         
         while self.is_trading_enabled:
             for symbol in self.config['trading_parameters']['symbols_to_trade']:
                 # Skip symbol if its model failed to load
-                if symbol not in self.models: continue
+                if not self.model_registry.has_assets(symbol): continue
                 
                 try:
-                    logging.info(f"--- Analyzing {symbol} ---")
-                    df_live = self.get_live_data_for_analysis(symbol)
-                    if df_live is None: continue
-
-                    tech_signal = self.tech_analyzer.analyze(df_live, self.models[symbol], self.scalers[symbol], self.feature_columns[symbol])
-                    struct_signal = self.struct_analyzer.analyze(df_live)
-                    fund_signal = self.fund_analyzer.get_news_sentiment_for_pair(symbol)
-                    
-                    scores = {'technical': tech_signal['score'], 'structural': struct_signal['score'], 'fundamental': fund_signal['score']}
-                    weights = self.config['strategy_weights']
-                    final_confidence = sum(scores[key] * weights[key] for key in scores)
-                    
-                    reasoning_block = (
-                        f"SYNTHESIS FOR {symbol}:\n"
-                        f"  [TA]: {tech_signal['narrative']}\n"
-                        f"  [SMC]: {struct_signal['narrative']}\n"
-                        f"  [FA]: {fund_signal['narrative']}\n"
-                        f"  >> FINAL CONFIDENCE: {final_confidence:.3f}"
-                    )
-                    
-                    logging.info(reasoning_block)
-                    self._update_status("Thinking", reasoning_block, scores)
-
-                    trade_signal = "HOLD"
-                    if final_confidence > 0.55: trade_signal = "BUY"
-                    elif final_confidence < -0.55: trade_signal = "SELL"
-                        
-                    if trade_signal != "HOLD":
-                        self.execute_trade_with_atr(symbol, trade_signal, final_confidence, df_live)
+                    decision = self.analyze_symbol(symbol)
+                    if decision is None: continue
+                    self.order_desk.handle_decision(decision)
 
                 except Exception as e:
                     logging.critical(f"UNHANDLED EXCEPTION during analysis of {symbol}: {e}", exc_info=True)
 
-            logging.info("All symbols analyzed. Waiting for next cycle...")
+            log_io_ms, log_handler_calls = LOG_IO_TIMER.reset()
+            logging.info(f"All symbols analyzed. Model registry: {self.model_registry.stats()}. "
+                         f"Log I/O on trading thread: {log_io_ms:.1f} ms over {log_handler_calls} handler calls. "
+                         f"Execution: {self.order_desk.execution.stats()}. Waiting for next cycle...")
+            self.order_desk._record_cycle_history()
             self._check_for_evaluation()
             time.sleep(60 * 5)
             
     def _check_for_evaluation(self):
-        """Checks if it's time to run the self-evaluation module."""
-        eval_period = self.config['evaluator_settings']['evaluation_period_trades']
-        if self.trade_counter > 0 and self.trade_counter % eval_period == 0:
-            logging.warning("Evaluation trade count reached. Triggering self-optimization cycle.")
-            evaluator = SeraphEvaluator(self.config)
-            evaluator.analyze_and_adapt()
-            
-            # Reload config to get new weights
-            with open('config.json', 'r') as f:
-                self.config = json.load(f)
-            logging.info("Configuration reloaded with new adapted weights.")
-
-    def execute_trade_with_atr(self, symbol, signal, confidence, df):
-        """Executes a trade with dynamically calculated SL/TP based on ATR."""
-        atr_period = self.config['dynamic_risk_management']['atr_period']
-        atr = (df['high'] - df['low']).rolling(window=atr_period).mean().iloc[-1]
-        point = mt5.symbol_info(symbol).point
-        
-        sl_multiplier = self.config['dynamic_risk_management']['sl_atr_multiplier']
-        tp_multiplier = self.config['dynamic_risk_management']['tp_atr_multiplier']
-        
-        sl_points = int((atr * sl_multiplier) / point)
-        tp_points = int((atr * tp_multiplier) / point)
-        
-        price = mt5.symbol_info_tick(symbol).ask if signal == "BUY" else mt5.symbol_info_tick(symbol).bid
-        sl = price - sl_points * point if signal == "BUY" else price + sl_points * point
-        tp = price + tp_points * point if signal == "BUY" else price - tp_points * point
-
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL, "symbol": symbol, "volume": self.config['trading_parameters']['lot_size'],
-            "type": mt5.ORDER_TYPE_BUY if signal == "BUY" else mt5.ORDER_TYPE_SELL,
-            "price": price, "sl": sl, "tp": tp, "deviation": 20, "magic": 202403,
-            "comment": f"{self.ai_name} {signal} {confidence:.2f}", "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
-        
-        result = mt5.order_send(request)
-        if result.retcode != mt5.TRADE_RETCODE_DONE:
-            logging.error(f"ORDER SEND FAILED for {symbol}: {result.comment}")
-        else:
-            logging.info(f"ORDER SENT for {symbol} {signal} @ {price}. Ticket: {result.order}")
-            self.logger.log_execution(symbol, signal, confidence, {'technical':0,'structural':0,'fundamental':0}, result.order)
-            self.trade_counter += 1
-
-    def _update_status(self, status, reasoning, scores):
-        """Writes the current status and reasoning to the status file for the dashboard."""
-        status_payload = {
-            'timestamp': datetime.now().isoformat(), 'ai_name': self.ai_name,
-            'status': status, 'reasoning': reasoning, 'scores': {k:round(v,3) for k,v in scores.items()}
-        }
-        with open(self.config["system_files"]["status_file"], 'w') as f:
-            json.dump(status_payload, f, indent=4)
\ No newline at end of file
+        """Checks if it's time to run the self-evaluation module. Returns True if the config was reloaded."""
+        if self.order_desk._evaluation_due():
+            self.config = self.order_desk._run_evaluation()
+            return True
+        return False
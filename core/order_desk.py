@@ -0,0 +1,83 @@
+import json
+import logging
+from datetime import datetime
+import MetaTrader5 as mt5
+
+from .trade_logger import TradeLogger
+from .evaluator import SeraphEvaluator
+from .log_config import log_decision
+from .execution import ExecutionEngine, BROKER_LOCK
+from .timeseries_store import TimeSeriesStore
+
+class OrderDesk:
+    """
+    Everything that happens after a decision is made: the decision stream, dashboard status and
+    history, order submission, the trade journal and the self-evaluation trigger. Only the process
+    that trades builds one, so analysis workers never open the execution thread or the history DB.
+    """
+    def __init__(self, config, guard=None):
+        self.config = config
+        self.ai_name = config["system_identity"]["name"]
+        self.trade_counter = 0
+
+        self.logger = TradeLogger(config)
+        self.execution = ExecutionEngine(config, on_fill=self._on_fill, guard=guard)
+        self.history = TimeSeriesStore(config)
+
+    def _connect_mt5(self):
+        # ... [Same connection logic as Evaluator] ...
+        pass
+
+    def handle_decision(self, decision):
+        """Publishes a decision to the decision stream, history and status file, and queues an order for it."""
+        log_decision(decision, self.config['strategy_weights'])
+        self._record_decision_history(decision)
+        self._update_status("Thinking", decision['reasoning'], decision['scores'])
+        if decision['signal'] != "HOLD":
+            self.execution.submit(decision)
+
+    def _on_fill(self, decision, report):
+        """Journals a filled order with its decision context and execution quality."""
+        self.logger.log_execution(decision['symbol'], decision['signal'], decision['confidence'], decision['scores'], report['ticket'], report)
+        self.trade_counter += 1
+
+    def _evaluation_due(self):
+        eval_period = self.config['evaluator_settings']['evaluation_period_trades']
+        return self.trade_counter > 0 and self.trade_counter % eval_period == 0
+
+    def _run_evaluation(self):
+        """Runs the evaluator and reloads the adapted weights. Must be called from the main loop, not the order thread."""
+        logging.warning("Evaluation trade count reached. Triggering self-optimization cycle.")
+        evaluator = SeraphEvaluator(self.config)
+        # The evaluator initializes and shuts down MT5, so no order may be in flight meanwhile
+        with BROKER_LOCK:
+            evaluator.analyze_and_adapt()
+
+        # Reload config to get new weights
+        with open('config.json', 'r') as f:
+            self.config = json.load(f)
+        self.execution.config = self.config
+        logging.info("Configuration reloaded with new adapted weights.")
+        return self.config
+
+    def _record_decision_history(self, decision):
+        self.history.add(f"confidence:{decision['symbol']}", decision['confidence'])
+
+    def _record_cycle_history(self):
+        """Snapshots account equity and the current strategy weights, then commits the cycle's history points."""
+        with BROKER_LOCK:
+            account = mt5.account_info()
+        if account is not None:
+            self.history.add('equity', account.equity)
+        for name, weight in self.config['strategy_weights'].items():
+            self.history.add(f"weight:{name}", weight)
+        self.history.flush()
+
+    def _update_status(self, status, reasoning, scores):
+        """Writes the current status and reasoning to the status file for the dashboard."""
+        status_payload = {
+            'timestamp': datetime.now().isoformat(), 'ai_name': self.ai_name,
+            'status': status, 'reasoning': reasoning, 'scores': {k:round(v,3) for k,v in scores.items()}
+        }
+        with open(self.config["system_files"]["status_file"], 'w') as f:
+            json.dump(status_payload, f, indent=4)
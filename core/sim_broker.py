@@ -0,0 +1,89 @@
+import time
+import random
+import itertools
+from collections import namedtuple
+from types import SimpleNamespace
+
+SymbolInfo = namedtuple('SymbolInfo', ['name', 'point', 'digits', 'volume_step', 'volume_min', 'volume_max'])
+Tick = namedtuple('Tick', ['time', 'bid', 'ask'])
+Position = namedtuple('Position', ['ticket', 'symbol', 'type', 'volume', 'price_open', 'sl', 'tp', 'magic', 'profit'])
+
+class SimulatedBroker:
+    """
+    A stand-in for the MetaTrader5 module covering the calls the execution path makes
+    (symbol_info, symbol_info_tick, order_send, positions_get, last_error). Requotes, slippage and
+    round-trip latency are configurable, and call counts are kept so caching can be verified.
+    """
+    # Values mirror the MetaTrader5 constants
+    TRADE_ACTION_DEAL = 1
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_IOC = 1
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_PRICE_CHANGED = 10020
+    TRADE_RETCODE_PRICE_OFF = 10021
+
+    def __init__(self, latency_seconds=0.0, requote_probability=0.0, max_slippage_points=0, seed=None):
+        self.latency_seconds = latency_seconds
+        self.requote_probability = requote_probability
+        self.max_slippage_points = max_slippage_points
+        self.rng = random.Random(seed)
+        self.symbols = {}
+        self.ticks = {}
+        self.positions = []
+        self.scripted_retcodes = []
+        self.calls = {'symbol_info': 0, 'symbol_info_tick': 0, 'order_send': 0}
+        self._tickets = itertools.count(1000)
+
+    def add_symbol(self, symbol, bid, ask, point=0.00001, digits=5, volume_step=0.01, volume_min=0.01, volume_max=100.0):
+        self.symbols[symbol] = SymbolInfo(symbol, point, digits, volume_step, volume_min, volume_max)
+        self.set_tick(symbol, bid, ask)
+
+    def set_tick(self, symbol, bid, ask):
+        self.ticks[symbol] = Tick(int(time.time()), bid, ask)
+
+    def script_retcodes(self, *retcodes):
+        """Queues retcodes that the next order_send calls return before normal behaviour resumes."""
+        self.scripted_retcodes.extend(retcodes)
+
+    def symbol_info(self, symbol):
+        self.calls['symbol_info'] += 1
+        return self.symbols.get(symbol)
+
+    def symbol_info_tick(self, symbol):
+        self.calls['symbol_info_tick'] += 1
+        return self.ticks.get(symbol)
+
+    def positions_get(self, symbol=None):
+        return tuple(p for p in self.positions if symbol is None or p.symbol == symbol)
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def order_send(self, request):
+        self.calls['order_send'] += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+        symbol = request['symbol']
+        info, tick = self.symbols.get(symbol), self.ticks.get(symbol)
+        if info is None or tick is None:
+            return SimpleNamespace(retcode=self.TRADE_RETCODE_INVALID, order=0, deal=0, price=0.0, volume=0.0, comment='Unknown symbol', bid=0.0, ask=0.0)
+
+        retcode = self.scripted_retcodes.pop(0) if self.scripted_retcodes else None
+        if retcode is None and self.rng.random() < self.requote_probability:
+            retcode = self.TRADE_RETCODE_REQUOTE
+        if retcode is not None and retcode != self.TRADE_RETCODE_DONE:
+            # A requote moves the market by a point so the caller has to refresh its tick
+            self.set_tick(symbol, tick.bid + info.point, tick.ask + info.point)
+            return SimpleNamespace(retcode=retcode, order=0, deal=0, price=0.0, volume=0.0, comment='Requote', bid=tick.bid, ask=tick.ask)
+
+        is_buy = request['type'] == self.ORDER_TYPE_BUY
+        slippage = self.rng.randint(0, self.max_slippage_points) * info.point if self.max_slippage_points else 0.0
+        fill_price = round((tick.ask + slippage) if is_buy else (tick.bid - slippage), info.digits)
+        ticket = next(self._tickets)
+        self.positions.append(Position(ticket, symbol, request['type'], request['volume'], fill_price, request['sl'], request['tp'], request['magic'], 0.0))
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, order=ticket, deal=ticket, price=fill_price, volume=request['volume'], comment='Request executed', bid=tick.bid, ask=tick.ask)
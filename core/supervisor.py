@@ -0,0 +1,271 @@
+import logging
+import threading
+import time
+import multiprocessing as mp
+from multiprocessing.connection import wait
+import MetaTrader5 as mt5
+
+from .order_desk import OrderDesk
+from .execution import MAGIC_NUMBER
+from .log_config import LOG_IO_TIMER, RecordForwarder, configure_worker_logging
+
+class _WorkerChannel:
+    """
+    The worker's end of its private pipe to the supervisor. Carries decisions, heartbeats and log
+    records (it stands in for the queue of a QueueHandler), so a worker that has to be killed can
+    only damage its own channel, never another worker's.
+    """
+    def __init__(self, worker_id, conn):
+        self.worker_id = worker_id
+        self.conn = conn
+        self._lock = threading.Lock()
+
+    def send(self, kind, payload):
+        with self._lock:
+            self.conn.send((kind, self.worker_id, payload))
+
+    def put_nowait(self, record):
+        self.send('log', record)
+
+def _worker_main(worker_id, config, symbols, conn):
+    """
+    Entry point of a worker process. Owns the models and indicator state for its symbols,
+    streams every decision back to the supervisor and never sends orders itself.
+    """
+    # Imported here so the supervisor process never loads TensorFlow or the NLP stack
+    from .orchestrator import SeraphROrchestrator
+
+    channel = _WorkerChannel(worker_id, conn)
+    configure_worker_logging(config, worker_id, channel)
+    config = dict(config, trading_parameters=dict(config['trading_parameters'], symbols_to_trade=symbols))
+    cycle_seconds = config.get('supervisor', {}).get('cycle_seconds', 60 * 5)
+
+    bot = SeraphROrchestrator(config, trade=False)
+    if not bot._connect_mt5(): return
+    bot._load_all_models()
+    logging.info(f"Worker {worker_id} online with symbols: {symbols}")
+
+    while True:
+        channel.send('heartbeat', None)
+        for symbol in symbols:
+            if not bot.model_registry.has_assets(symbol): continue
+            try:
+                decision = bot.analyze_symbol(symbol)
+                if decision is not None:
+                    channel.send('decision', decision)
+            except Exception as e:
+                logging.critical(f"UNHANDLED EXCEPTION during analysis of {symbol}: {e}", exc_info=True)
+        log_io_ms, log_handler_calls = LOG_IO_TIMER.reset()
+        channel.send('cycle_complete', {'model_registry': bot.model_registry.stats(), 'log_io_ms': round(log_io_ms, 1), 'log_handler_calls': log_handler_calls})
+
+        # Sleep until the next cycle, waking early for control messages
+        deadline = time.monotonic() + cycle_seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            if not conn.poll(remaining):
+                break
+            command, payload = conn.recv()
+            if command == 'stop':
+                logging.info(f"Worker {worker_id} stopping.")
+                mt5.shutdown()
+                return
+            if command == 'config':
+                bot.config = dict(payload, trading_parameters=dict(payload['trading_parameters'], symbols_to_trade=symbols))
+                logging.info(f"Worker {worker_id} received updated strategy weights.")
+
+class SeraphSupervisor:
+    """
+    Runs the analysis loop across several worker processes, each owning a partition of the symbols.
+    Workers only think; the supervisor owns order submission so global exposure limits, the
+    trade counter and the self-evaluation trigger stay consistent. Crashed or silent workers are
+    restarted individually while the others keep running. Each worker talks to the supervisor over
+    its own pipe, so stopping or killing one cannot corrupt a channel the others depend on.
+    """
+    def __init__(self, config, num_workers=None):
+        self.config = config
+        self.ai_name = config["system_identity"]["name"]
+        settings = config.get('supervisor', {})
+        symbols = config['trading_parameters']['symbols_to_trade']
+        requested = num_workers or settings.get('num_workers', 1)
+        self.num_workers = max(1, min(requested, len(symbols)))
+        self.max_open_positions = settings.get('max_open_positions', 10)
+        self.max_positions_per_symbol = settings.get('max_positions_per_symbol', 1)
+        self.heartbeat_timeout = settings.get('heartbeat_timeout_seconds', 60 * 15)
+        self.restart_backoff = settings.get('restart_backoff_seconds', 10)
+        self.max_restart_backoff = settings.get('max_restart_backoff_seconds', 300)
+        self.cycle_seconds = settings.get('cycle_seconds', 60 * 5)
+
+        # Only execution, status, history and evaluation run here; analysis stays in the workers
+        self.order_desk = OrderDesk(config, guard=self._within_exposure_limits)
+        self.order_desk.execution.on_fill = self._on_fill
+        self._evaluation_requested = threading.Event()
+        self.ctx = mp.get_context('spawn')
+        # Workers forward their log records over their pipe so only this process touches the log files
+        self.log_forwarder = RecordForwarder()
+        self.partitions = {i: symbols[i::self.num_workers] for i in range(self.num_workers)}
+        self.workers = {}
+        self.is_running = False
+
+        # Workers that reported since equity and weights were last recorded
+        self._round_reported = set()
+        self._last_round_recorded = time.monotonic()
+
+    def _start_worker(self, worker_id):
+        conn, child_conn = self.ctx.Pipe()
+        process = self.ctx.Process(
+            target=_worker_main, name=f"{self.ai_name}-worker-{worker_id}", daemon=True,
+            args=(worker_id, self.config, self.partitions[worker_id], child_conn)
+        )
+        process.start()
+        child_conn.close()
+        previous = self.workers.get(worker_id, {})
+        self.workers[worker_id] = {
+            'process': process, 'conn': conn, 'last_seen': time.monotonic(),
+            'restarts': previous.get('restarts', -1) + 1, 'backoff': previous.get('backoff', self.restart_backoff),
+            'restart_at': None,
+        }
+        logging.info(f"Started worker {worker_id} (pid {process.pid}) for symbols: {self.partitions[worker_id]}")
+
+    def _send_control(self, worker, command, payload):
+        try:
+            worker['conn'].send((command, payload))
+        except (OSError, ValueError):
+            pass  # Worker already gone; the supervision pass restarts it
+
+    def _stop_worker(self, worker_id, timeout=10):
+        """Asks a worker to stop and waits for it, reading its pipe meanwhile; terminates it only as a last resort."""
+        worker = self.workers[worker_id]
+        process, conn = worker['process'], worker['conn']
+        if process.is_alive():
+            self._send_control(worker, 'stop', None)
+        deadline = time.monotonic() + timeout
+        while process.is_alive() and time.monotonic() < deadline:
+            # Keep reading every pipe so neither this worker nor the others block on a full one
+            self._service_pipes(timeout=0.1)
+            process.join(timeout=0)
+        if process.is_alive():
+            logging.error(f"Worker {worker_id} did not stop within {timeout}s. Terminating.")
+            process.terminate()
+            process.join(timeout=10)
+        conn.close()
+
+    def _stop_all_workers(self):
+        for worker in self.workers.values():
+            if worker['process'].is_alive():
+                self._send_control(worker, 'stop', None)
+        for worker_id, worker in self.workers.items():
+            if not worker['conn'].closed:
+                self._stop_worker(worker_id)
+
+    def run(self):
+        """Starts the workers and services their decisions until interrupted."""
+        logging.info(f"--- {self.ai_name.upper()} SUPERVISOR DEPLOYED ({self.num_workers} WORKERS) ---")
+        if not self.order_desk._connect_mt5(): return
+
+        self.order_desk.execution.start()
+        for worker_id in self.partitions:
+            self._start_worker(worker_id)
+        self.is_running = True
+
+        try:
+            while self.is_running:
+                self._service_pipes(timeout=1.0)
+                if self._evaluation_requested.is_set():
+                    self._evaluation_requested.clear()
+                    self._run_evaluation()
+                self._supervise_workers()
+        except KeyboardInterrupt:
+            logging.warning("Supervisor interrupted. Shutting down workers...")
+        finally:
+            self.is_running = False
+            self._stop_all_workers()
+            self.order_desk.execution.stop()
+            mt5.shutdown()
+
+    def _service_pipes(self, timeout):
+        """Waits up to `timeout` for any worker pipe to become readable and handles what arrived."""
+        conns = {worker['conn']: worker_id for worker_id, worker in self.workers.items() if not worker['conn'].closed}
+        for conn in wait(list(conns), timeout=timeout):
+            self._drain(conns[conn])
+
+    def _drain(self, worker_id, timeout=0):
+        """Handles every message waiting on a worker's pipe. A closed pipe means the worker exited."""
+        conn = self.workers[worker_id]['conn']
+        try:
+            while conn.poll(timeout):
+                self._handle_message(*conn.recv())
+                timeout = 0
+        except (EOFError, OSError):
+            conn.close()
+
+    def _run_evaluation(self):
+        self.config = self.order_desk._run_evaluation()
+        for worker in self.workers.values():
+            self._send_control(worker, 'config', self.config)
+
+    def _handle_message(self, kind, worker_id, payload):
+        if kind == 'log':
+            self.log_forwarder.handle(payload)
+            return
+        if worker_id in self.workers:
+            self.workers[worker_id]['last_seen'] = time.monotonic()
+            self.workers[worker_id]['backoff'] = self.restart_backoff
+
+        if kind == 'decision':
+            self.order_desk.handle_decision(payload)
+        elif kind == 'cycle_complete':
+            logging.info(f"Worker {worker_id} finished its cycle: {payload}")
+            self._round_reported.add(worker_id)
+            self._maybe_record_round()
+
+    def _maybe_record_round(self):
+        """Records equity and weights once per round: when every live worker has reported, or a full cycle has passed."""
+        live = {worker_id for worker_id, worker in self.workers.items() if worker['restart_at'] is None and worker['process'].is_alive()}
+        if live <= self._round_reported or time.monotonic() - self._last_round_recorded >= self.cycle_seconds:
+            self.order_desk._record_cycle_history()
+            self._round_reported.clear()
+            self._last_round_recorded = time.monotonic()
+
+    def _on_fill(self, decision, report):
+        """Runs on the execution thread: journals the fill and hands any evaluation to the main loop."""
+        self.order_desk._on_fill(decision, report)
+        if self.order_desk._evaluation_due():
+            self._evaluation_requested.set()
+
+    def _within_exposure_limits(self, symbol):
+        positions = mt5.positions_get()
+        if positions is None:
+            logging.error(f"Could not read open positions, refusing order for {symbol}: {mt5.last_error()}")
+            return False
+        ours = [p for p in positions if p.magic == MAGIC_NUMBER]
+        if len(ours) >= self.max_open_positions:
+            logging.warning(f"EXPOSURE LIMIT: {len(ours)} open positions (max {self.max_open_positions}). Skipping {symbol}.")
+            return False
+        per_symbol = sum(1 for p in ours if p.symbol == symbol)
+        if per_symbol >= self.max_positions_per_symbol:
+            logging.warning(f"EXPOSURE LIMIT: {per_symbol} open positions on {symbol} (max {self.max_positions_per_symbol}). Skipping.")
+            return False
+        return True
+
+    def _supervise_workers(self):
+        """Restarts workers that died or stopped sending heartbeats, with exponential backoff."""
+        now = time.monotonic()
+        for worker_id, worker in self.workers.items():
+            process = worker['process']
+            if worker['restart_at'] is not None:
+                if now >= worker['restart_at']:
+                    self._start_worker(worker_id)
+                continue
+
+            if process.is_alive() and now - worker['last_seen'] > self.heartbeat_timeout:
+                logging.error(f"Worker {worker_id} missed its heartbeat for {now - worker['last_seen']:.0f}s. Stopping it.")
+                self._stop_worker(worker_id)
+
+            if not process.is_alive():
+                if not worker['conn'].closed:
+                    self._drain(worker_id)
+                    worker['conn'].close()
+                backoff = worker['backoff']
+                logging.error(f"Worker {worker_id} exited with code {process.exitcode}. Restarting in {backoff}s "
+                              f"(restart #{worker['restarts'] + 1}).")
+                worker['restart_at'] = now + backoff
+                worker['backoff'] = min(backoff * 2, self.max_restart_backoff)
@@ -0,0 +1,126 @@
+import time
+import sqlite3
+import logging
+import numpy as np
+
+# Bucket widths in seconds; 0 is the raw stream
+RESOLUTIONS = (0, 60, 900, 3600, 86400)
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets downsampling to at most `threshold` points, keeping the first and last."""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    every = (n - 2) / (threshold - 2)
+    sampled = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = xs[next_start:next_end].mean(), ys[next_start:next_end].mean()
+        areas = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(np.argmax(areas))
+        sampled.append(a)
+    sampled.append(n - 1)
+    return xs[sampled].tolist(), ys[sampled].tolist()
+
+class TimeSeriesStore:
+    """
+    A small SQLite-backed store for dashboard history (equity, per-symbol confidence, strategy weights).
+    Every point is kept raw for a retention window and folded into fixed-width rollups, so a query for
+    any time range reads a bounded number of rows before LTTB reduces it to the requested point count.
+    Writes are buffered and committed once per cycle; the dashboard reads from a separate process.
+    """
+    def __init__(self, config):
+        settings = config.get('history_store', {})
+        self.db_file = settings.get('db_file', 'seraph_history.db')
+        self.max_points = settings.get('max_points', 500)
+        self.raw_retention = settings.get('raw_retention_days', 7) * 86400
+        self._buffer = []
+        self._conn = sqlite3.connect(self.db_file, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            "series TEXT NOT NULL, resolution INTEGER NOT NULL, ts REAL NOT NULL, "
+            "sum REAL NOT NULL, count INTEGER NOT NULL, last REAL NOT NULL, "
+            "PRIMARY KEY (series, resolution, ts))"
+        )
+        self._conn.commit()
+
+    # --- Writing ---
+
+    def add(self, series, value, ts=None):
+        """Buffers one point; nothing touches the disk until flush()."""
+        self._buffer.append((series, time.time() if ts is None else ts, float(value)))
+
+    def flush(self):
+        """Commits buffered points to the raw stream and every rollup in a single transaction."""
+        if not self._buffer:
+            return
+        rows = []
+        for series, ts, value in self._buffer:
+            for resolution in RESOLUTIONS:
+                bucket = ts if resolution == 0 else ts - ts % resolution
+                rows.append((series, resolution, bucket, value, value))
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO points (series, resolution, ts, sum, count, last) VALUES (?, ?, ?, ?, 1, ?) "
+                    "ON CONFLICT(series, resolution, ts) DO UPDATE SET "
+                    "sum = sum + excluded.sum, count = count + 1, last = excluded.last", rows)
+                self._conn.execute("DELETE FROM points WHERE resolution = 0 AND ts < ?", (time.time() - self.raw_retention,))
+            self._buffer.clear()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to write history points: {e}")
+
+    # --- Reading ---
+
+    def list_series(self, prefix=''):
+        rows = self._conn.execute("SELECT DISTINCT series FROM points WHERE resolution = ? AND series LIKE ?", (RESOLUTIONS[-1], f"{prefix}%"))
+        return sorted(row[0] for row in rows)
+
+    def latest_ts(self, series):
+        row = self._conn.execute("SELECT MAX(ts) FROM points WHERE series = ? AND resolution = 0", (series,)).fetchone()
+        return row[0] if row and row[0] is not None else 0.0
+
+    def query(self, series, start=None, end=None, max_points=None):
+        """Returns (timestamps, values) for a range, downsampled to at most max_points."""
+        max_points = max_points or self.max_points
+        end = time.time() if end is None else end
+        start = self._first_ts(series) if start is None else start
+        resolution = self._pick_resolution(series, start, end, max_points)
+        rows = self._conn.execute(
+            "SELECT ts, sum / count FROM points WHERE series = ? AND resolution = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (series, resolution, start - resolution, end)).fetchall()
+        if not rows:
+            return [], []
+        xs, ys = zip(*rows)
+        return lttb(xs, ys, max_points)
+
+    def since(self, series, ts, limit=None):
+        """Returns raw (timestamps, values) strictly newer than ts, for incremental client updates."""
+        rows = self._conn.execute(
+            "SELECT ts, last FROM points WHERE series = ? AND resolution = 0 AND ts > ? ORDER BY ts LIMIT ?",
+            (series, ts, limit or self.max_points)).fetchall()
+        if not rows:
+            return [], []
+        xs, ys = zip(*rows)
+        return list(xs), list(ys)
+
+    def _first_ts(self, series):
+        row = self._conn.execute("SELECT MIN(ts) FROM points WHERE series = ? AND resolution = ?", (series, RESOLUTIONS[-1])).fetchone()
+        return row[0] if row and row[0] is not None else 0.0
+
+    def _pick_resolution(self, series, start, end, max_points):
+        """Finest resolution that covers the range without reading more than ten times max_points rows."""
+        raw_floor = time.time() - self.raw_retention
+        for resolution in RESOLUTIONS:
+            if resolution == 0 and start < raw_floor:
+                continue
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM points WHERE series = ? AND resolution = ? AND ts >= ? AND ts <= ?",
+                (series, resolution, start, end)).fetchone()[0]
+            if count <= max_points * 10:
+                return resolution
+        return RESOLUTIONS[-1]
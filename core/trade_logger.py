@@ -11,7 +11,7 @@ class TradeLogger:
         """Initializes the logger with the path to the journal file from the config."""
         self.journal_path = config['evaluator_settings']['journal_file']
 
-    def log_execution(self, symbol: str, signal: str, confidence_score: float, scores_breakdown: dict, ticket_id: int):
+    def log_execution(self, symbol: str, signal: str, confidence_score: float, scores_breakdown: dict, ticket_id: int, execution_report: dict = None):
         """
         Writes a detailed entry for a single executed trade.
 
@@ -21,6 +21,7 @@ class TradeLogger:
             confidence_score (float): The final synthesized confidence score.
             scores_breakdown (dict): The individual scores from each analyzer brain.
             ticket_id (int): The order ticket ID from the MT5 broker.
+            execution_report (dict, optional): Fill price, slippage, signal-to-fill latency and retries.
         """
         try:
             trade_context = {
@@ -31,6 +32,8 @@ class TradeLogger:
                 'confidence': confidence_score,
                 'scores': scores_breakdown
             }
+            if execution_report is not None:
+                trade_context['execution'] = {k: v for k, v in execution_report.items() if k != 'ticket'}
             with open(self.journal_path, 'a') as f:
                 f.write(json.dumps(trade_context) + '\n')
             logging.info(f"Trade context for ticket {ticket_id} successfully logged to journal.")
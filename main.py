@@ -6,24 +6,12 @@ import sys
 # Add core directory to Python path to allow imports
 sys.path.append('core')
 
+from core.log_config import setup_logging
 from core.orchestrator import SeraphROrchestrator
+from core.supervisor import SeraphSupervisor
 from core.evaluator import SeraphEvaluator
 from seraph_trainer import SeraphTrainer
 
-def setup_logging(config):
-    """Configures the central logger for the application."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format=f'%(asctime)s - [%(name)s] - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(config["system_files"]["log_file"]),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    # Set higher logging level for verbose libraries
-    logging.getLogger('urllib3').setLevel(logging.WARNING)
-    logging.getLogger('tensorflow').setLevel(logging.ERROR)
-
 def main():
     """Parses command-line arguments to run the specified action."""
     parser = argparse.ArgumentParser(description="Seraph-R: The Reasoning AI Trading System")
@@ -33,6 +21,12 @@ def main():
         choices=['run', 'train', 'evaluate'],
         help="The action to perform: 'run' the live bot, 'train' all models, or 'evaluate' past performance."
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help="For 'run': number of worker processes to shard symbols across. Defaults to supervisor.num_workers in config.json; 1 runs a single in-process orchestrator."
+    )
     args = parser.parse_args()
 
     try:
@@ -48,9 +42,15 @@ def main():
     main_logger = logging.getLogger(config["system_identity"]["name"])
 
     if args.action == 'run':
-        main_logger.info("Action 'run' selected. Initializing Orchestrator...")
-        bot = SeraphROrchestrator(config)
-        bot.run()
+        num_workers = args.workers or config.get('supervisor', {}).get('num_workers', 1)
+        if num_workers > 1:
+            main_logger.info(f"Action 'run' selected. Initializing Supervisor with {num_workers} workers...")
+            supervisor = SeraphSupervisor(config, num_workers)
+            supervisor.run()
+        else:
+            main_logger.info("Action 'run' selected. Initializing Orchestrator...")
+            bot = SeraphROrchestrator(config)
+            bot.run()
     elif args.action == 'train':
         main_logger.info("Action 'train' selected. Initializing Trainer...")
         trainer = SeraphTrainer(config)
@@ -0,0 +1,186 @@
+import os
+import json
+import hashlib
+import inspect
+import logging
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so old entries are ignored
+FEATURE_CACHE_VERSION = 2
+
+def index_to_ns(index):
+    """Timestamps as int64 nanoseconds regardless of the index's datetime resolution."""
+    return np.asarray(index.values, dtype='datetime64[ns]').view(np.int64)
+
+class FeatureCache:
+    """
+    Materializes TechnicalAnalyzer feature matrices on disk so training, backtests and the live loop
+    do not recompute indicators over the same history. Each entry is a float32 row-major matrix
+    (column order matching `{symbol}_{timeframe}_features.json`) plus an int64 timestamp index,
+    both served as memory-mapped arrays. Entries are keyed by a hash of the feature code and the
+    column list, and record the raw bar range they were built from; when newer bars arrive only
+    the tail is recomputed and appended. Read-only consumers such as the trainer get the memmap
+    views themselves from get_matrix; get_frame copies into a DataFrame because live analysis
+    also needs df_raw's own columns and the still-forming bar.
+    """
+    def __init__(self, config, tech_analyzer):
+        settings = config.get('feature_cache', {})
+        self.enabled = settings.get('enabled', True)
+        self.cache_folder = settings.get('cache_folder', 'feature_cache')
+        self.warmup_bars = settings.get('warmup_bars', 200)
+        self.timeframe = config['trading_parameters']['timeframe']
+        self.tech_analyzer = tech_analyzer
+        self.code_hash = self._feature_code_hash()
+        if self.enabled and not os.path.exists(self.cache_folder):
+            os.makedirs(self.cache_folder)
+
+    def _feature_code_hash(self):
+        """Hashes the indicator source so a code change invalidates every cached matrix."""
+        source = inspect.getsource(type(self.tech_analyzer).calculate_features)
+        return hashlib.sha256(f"{FEATURE_CACHE_VERSION}:{source}".encode()).hexdigest()
+
+    def _paths(self, symbol, columns):
+        key = hashlib.sha256(f"{self.code_hash}:{json.dumps(columns)}".encode()).hexdigest()[:16]
+        base = os.path.join(self.cache_folder, f"{symbol}_{self.timeframe}_{key}")
+        return f"{base}_meta.json", f"{base}_features.f32", f"{base}_times.i64"
+
+    def get_frame(self, symbol: str, df_raw: pd.DataFrame, feature_columns: list) -> pd.DataFrame:
+        """
+        Returns df_raw's rows that have complete features, with the cached indicator columns joined
+        onto df_raw's own columns, matching calculate_features + dropna. The last bar of df_raw is treated as still forming: it is never materialized and is
+        recomputed on every call, together with the bar before it whose FVG flag depends on it.
+        """
+        if not self.enabled or len(df_raw) < 2:
+            df = self.tech_analyzer.calculate_features(df_raw.copy())
+            df.dropna(inplace=True)
+            return df
+
+        raw_times = index_to_ns(df_raw.index)
+        meta, matrix_path, times_path = self._sync(symbol, df_raw, feature_columns)
+
+        # Fresh rows for the last two bars, computed over the usual warm-up window
+        tail_start = raw_times[-2]
+        tail_times, tail_matrix = self._compute(df_raw.iloc[max(0, len(df_raw) - 2 - self.warmup_bars):], feature_columns)
+        fresh = tail_times >= tail_start
+
+        times, matrix = self._open(meta, matrix_path, times_path)
+        lo = np.searchsorted(times, raw_times[0], side='left')
+        hi = np.searchsorted(times, tail_start, side='left')
+        all_times = np.concatenate([times[lo:hi], tail_times[fresh]])
+        all_rows = np.concatenate([matrix[lo:hi], tail_matrix[fresh]])
+
+        # Only indicator columns come from the cache; prices stay df_raw's own float64 values
+        indicator_columns = [col for col in feature_columns if col not in df_raw.columns]
+        positions = [feature_columns.index(col) for col in indicator_columns]
+        df = df_raw.loc[df_raw.index[np.isin(raw_times, all_times)]].copy()
+        df[indicator_columns] = all_rows[np.isin(all_times, raw_times)][:, positions]
+        return df
+
+    def get_matrix(self, symbol: str, df_raw: pd.DataFrame, feature_columns: list):
+        """
+        Returns (times, matrix) for df_raw's closed bars that have complete features, with matrix
+        columns in feature_columns order. With the cache enabled both are read-only memory-mapped
+        views of the entry, so nothing is copied until the caller reads it.
+        """
+        if not self.enabled or len(df_raw) < 2:
+            return self._compute(df_raw.iloc[:-1], feature_columns)
+
+        raw_times = index_to_ns(df_raw.index)
+        meta, matrix_path, times_path = self._sync(symbol, df_raw, feature_columns)
+        times, matrix = self._open(meta, matrix_path, times_path)
+        lo = np.searchsorted(times, raw_times[0], side='left')
+        hi = np.searchsorted(times, raw_times[-2], side='right')
+        return times[lo:hi], matrix[lo:hi]
+
+    def _sync(self, symbol, df_raw, feature_columns):
+        """Brings the entry up to df_raw's last closed bar. Returns (meta, matrix_path, times_path)."""
+        meta_path, matrix_path, times_path = self._paths(symbol, feature_columns)
+        df_closed = df_raw.iloc[:-1]
+        raw_times = index_to_ns(df_raw.index)
+        meta = self._read_meta(meta_path)
+
+        if meta is None or not meta['source_start'] <= raw_times[0] <= meta['source_end']:
+            # No entry, or the requested history is not contiguous with it: rebuild from scratch
+            meta = self._build(df_closed, feature_columns, meta_path, matrix_path, times_path)
+        elif raw_times[-2] > meta['source_end']:
+            meta = self._append_tail(df_closed, feature_columns, meta, meta_path, matrix_path, times_path)
+        return meta, matrix_path, times_path
+
+    def _compute(self, df_raw, feature_columns):
+        df = self.tech_analyzer.calculate_features(df_raw.copy())
+        df = df[feature_columns].dropna()
+        return index_to_ns(df.index), np.ascontiguousarray(df.to_numpy(dtype=np.float32))
+
+    def _build(self, df_raw, feature_columns, meta_path, matrix_path, times_path):
+        times, matrix = self._compute(df_raw, feature_columns)
+        raw_times = index_to_ns(df_raw.index)
+        for path, data in ((matrix_path, matrix), (times_path, times)):
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(data.tobytes())
+            os.replace(f"{path}.tmp", path)
+        meta = {
+            'version': FEATURE_CACHE_VERSION, 'feature_hash': self.code_hash, 'columns': feature_columns,
+            'n_rows': len(times), 'source_start': int(raw_times[0]), 'source_end': int(raw_times[-1]),
+        }
+        self._write_meta(meta_path, meta)
+        logging.info(f"Feature cache built for {os.path.basename(matrix_path)}: {len(times)} rows.")
+        return meta
+
+    def _append_tail(self, df_raw, feature_columns, meta, meta_path, matrix_path, times_path):
+        """Recomputes features over the new bars plus a warm-up window and appends them to the entry."""
+        raw_times = index_to_ns(df_raw.index)
+        first_new = int(np.searchsorted(raw_times, meta['source_end'], side='right'))
+        # Re-derive the last cached bar as well: its FVG flag depends on the bar that follows it
+        context_start = max(0, first_new - 1 - self.warmup_bars)
+        times, matrix = self._compute(df_raw.iloc[context_start:], feature_columns)
+
+        n_rows, n_cols = meta['n_rows'], len(feature_columns)
+        cached_times, _ = self._open(meta, matrix_path, times_path)
+        last_cached = cached_times[-1] if n_rows else None
+
+        if last_cached is not None:
+            overlap = np.flatnonzero(times == last_cached)
+            if overlap.size:
+                rows = np.memmap(matrix_path, dtype=np.float32, mode='r+', shape=(n_rows, n_cols))
+                rows[-1] = matrix[overlap[0]]
+                rows.flush()
+                del rows
+            keep = times > last_cached
+            times, matrix = times[keep], matrix[keep]
+
+        # Truncate to the committed row count first so a torn earlier append is discarded
+        for path, data, row_bytes in ((matrix_path, matrix, n_cols * 4), (times_path, times, 8)):
+            with open(path, 'r+b') as f:
+                f.truncate(n_rows * row_bytes)
+                f.seek(0, os.SEEK_END)
+                f.write(data.tobytes())
+
+        meta = dict(meta, n_rows=n_rows + len(times), source_end=int(raw_times[-1]))
+        self._write_meta(meta_path, meta)
+        return meta
+
+    @staticmethod
+    def _open(meta, matrix_path, times_path):
+        n_rows, n_cols = meta['n_rows'], len(meta['columns'])
+        if n_rows == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, n_cols), dtype=np.float32)
+        times = np.memmap(times_path, dtype=np.int64, mode='r', shape=(n_rows,))
+        matrix = np.memmap(matrix_path, dtype=np.float32, mode='r', shape=(n_rows, n_cols))
+        return times, matrix
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if meta.get('version') != FEATURE_CACHE_VERSION or meta.get('feature_hash') != self.code_hash:
+            return None
+        return meta
+
+    @staticmethod
+    def _write_meta(meta_path, meta):
+        with open(f"{meta_path}.tmp", 'w') as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
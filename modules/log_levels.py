@@ -0,0 +1,6 @@
+import logging
+
+# Level for chatty per-symbol messages; only one in `hot_path_sample_every` of them is emitted.
+# Lives here so analyzers can use it without depending on core.
+HOT_PATH = 15
+logging.addLevelName(HOT_PATH, 'HOTPATH')
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 
 class StructuralAnalyzer:
     def __init__(self, config):
@@ -8,9 +9,10 @@ class StructuralAnalyzer:
     def analyze(self, df: pd.DataFrame) -> dict:
         score = 0
         narrative = "Market structure is consolidating with no clear bias."
+        # Mean high-low range over the last `atr_period` bars; also returned so SL/TP sizing reuses it
+        atr_period = self.config['dynamic_risk_management']['atr_period']
+        atr = float(np.mean(df['high'].to_numpy()[-atr_period:] - df['low'].to_numpy()[-atr_period:]))
         try:
-            atr_period = self.config['dynamic_risk_management']['atr_period']
-            atr = (df['high'] - df['low']).rolling(window=atr_period).mean().iloc[-1]
             bos_threshold = self.config['structural_parameters']['bos_choch_threshold_atr'] * atr
             
             recent_high = df['high'].rolling(self.lookback).max().iloc[-2]
@@ -26,6 +28,6 @@ class StructuralAnalyzer:
             if last_candle['close'] < recent_low - bos_threshold:
                 score -= 1.0; narrative = f"Bearish Break of Structure confirmed with a strong close below {recent_low:.4f}."
         except IndexError:
-            return {'score': 0, 'narrative': 'Not enough historical data for full structural analysis.'}
+            return {'score': 0, 'narrative': 'Not enough historical data for full structural analysis.', 'atr': atr}
 
-        return {'score': max(-1.0, min(1.0, score)), 'narrative': narrative}
\ No newline at end of file
+        return {'score': max(-1.0, min(1.0, score)), 'narrative': narrative, 'atr': atr}
\ No newline at end of file
@@ -2,12 +2,17 @@ import logging
 import pandas as pd
 import numpy as np
 
+from modules.log_levels import HOT_PATH
+
+# Canonical column order shared by the trainer, the feature cache and `{symbol}_{timeframe}_features.json`
+FEATURE_COLUMNS = ['close', 'high', 'low', 'open', 'tick_volume', 'sma_20', 'sma_50', 'ema_12', 'ema_26', 'macd', 'macd_signal', 'rsi', 'bb_upper', 'bb_lower', 'fvg']
+
 class TechnicalAnalyzer:
     def __init__(self, config):
         self.config = config
 
     def calculate_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        logging.info("Calculating technical features...")
+        logging.log(HOT_PATH, "Calculating technical features...")
         df['sma_20'] = df['close'].rolling(window=20).mean()
         df['sma_50'] = df['close'].rolling(window=50).mean()
         df['ema_12'] = df['close'].ewm(span=12, adjust=False).mean()
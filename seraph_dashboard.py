@@ -1,12 +1,14 @@
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 import MetaTrader5 as mt5
 import json
 from datetime import datetime
 import pandas as pd
 import plotly.graph_objects as go
 
+from core.timeseries_store import TimeSeriesStore
+
 # Load config to get dashboard settings without needing full app context
 try:
     with open("config.json", 'r') as f:
@@ -16,6 +18,11 @@ except FileNotFoundError:
     exit()
     
 AI_NAME = config["system_identity"]["name"]
+SYMBOLS = config['trading_parameters']['symbols_to_trade']
+HISTORY_RANGES = {'1h': 3600, '24h': 86400, '7d': 7 * 86400, '30d': 30 * 86400, 'All': None}
+# How often the unbounded 'All' range is re-queried; fixed ranges redraw once per downsampled bucket
+HISTORY_REDRAW_SECONDS = 300
+history = TimeSeriesStore(config)
 
 app = dash.Dash(__name__)
 app.title = f"{AI_NAME} Command Center"
@@ -54,6 +61,19 @@ app.layout = html.Div(style={'backgroundColor': '#111111', 'color': '#E0E0E0', '
             html.Div(id='account-info'),
         ]),
     ]),
+
+    # History Section (served from the downsampled time-series store)
+    html.Div(style={'marginTop': '20px'}, children=[
+        html.H2("HISTORY", style={'borderBottom': '1px solid #00BCD4'}),
+        html.Div(style={'display': 'flex', 'flexDirection': 'row', 'marginBottom': '10px'}, children=[
+            dcc.Dropdown(id='history-range', options=[{'label': k, 'value': k} for k in HISTORY_RANGES], value='24h', clearable=False, style={'width': '150px', 'color': '#111111', 'marginRight': '15px'}),
+            dcc.Dropdown(id='history-symbol', options=[{'label': s, 'value': s} for s in SYMBOLS], value=SYMBOLS[0], clearable=False, style={'width': '150px', 'color': '#111111'}),
+        ]),
+        dcc.Graph(id='equity-history', config={'displayModeBar': False}),
+        dcc.Graph(id='confidence-history', config={'displayModeBar': False}),
+        dcc.Graph(id='weights-history', config={'displayModeBar': False}),
+        dcc.Store(id='history-cursor'),
+    ]),
 ])
 
 @app.callback(
@@ -140,5 +160,69 @@ def update_dashboard(n):
     
     return status_text, eval_text, gauge_fig, conf_breakdown, strat_weights, reasoning_text, acc_text, pos_table
 
+def _history_figure(title, series_names, start, y_range=None):
+    """Full redraw of a history panel: each series downsampled to a fixed number of points for the range."""
+    fig = go.Figure()
+    for name in series_names:
+        xs, ys = history.query(name, start=start)
+        fig.add_trace(go.Scatter(x=[datetime.fromtimestamp(x) for x in xs], y=ys, mode='lines', name=name.split(':')[-1]))
+    fig.update_layout(title=title, paper_bgcolor='#111111', plot_bgcolor='#1E1E1E', font={'color': '#E0E0E0'}, height=280, margin={'l': 40, 'r': 20, 't': 40, 'b': 30})
+    if y_range:
+        fig.update_yaxes(range=y_range)
+    return fig
+
+def _history_extension(series_names, cursor):
+    """
+    Only the raw points newer than the client's last timestamp for each series, as Graph.extendData.
+    Nothing is trimmed here: the periodic redraw re-applies the time range and the downsampling.
+    """
+    xs, ys, traces = [], [], []
+    for index, name in enumerate(series_names):
+        new_x, new_y = history.since(name, cursor.get(name, 0.0))
+        if new_x:
+            cursor[name] = new_x[-1]
+            xs.append([datetime.fromtimestamp(x) for x in new_x]); ys.append(new_y); traces.append(index)
+    if not traces:
+        return dash.no_update
+    return dict(x=xs, y=ys), traces
+
+@app.callback(
+    [Output('equity-history', 'figure'), Output('equity-history', 'extendData'),
+     Output('confidence-history', 'figure'), Output('confidence-history', 'extendData'),
+     Output('weights-history', 'figure'), Output('weights-history', 'extendData'),
+     Output('history-cursor', 'data')],
+    [Input('interval-component', 'n_intervals'), Input('history-range', 'value'), Input('history-symbol', 'value')],
+    [State('history-cursor', 'data')]
+)
+def update_history(n, range_key, symbol, cursor):
+    triggered = [t['prop_id'] for t in dash.callback_context.triggered]
+    span = HISTORY_RANGES[range_key]
+    now = datetime.now().timestamp()
+    # Appended raw points would outgrow the range and the point budget, so redraw once they span a bucket
+    redraw_every = span / history.max_points if span else HISTORY_REDRAW_SECONDS
+    redraw = (not cursor or cursor.get('_key') != [range_key, symbol] or not all(t.startswith('interval-component') for t in triggered)
+              or now - cursor.get('_drawn', 0.0) >= redraw_every)
+
+    outputs = []
+    if redraw:
+        # Range or symbol changed, first load, or a bucket's worth of points appended: send the downsampled history
+        panels = [
+            ('EQUITY CURVE', ['equity'], None),
+            (f"CONFIDENCE HISTORY // {symbol}", [f"confidence:{symbol}"], [-1, 1]),
+            ('WEIGHT ADAPTATION', history.list_series('weight:'), [0, 1]),
+        ]
+        start = now - span if span else None
+        # The drawn series lists fix each panel's trace order until the next redraw
+        cursor = {'_key': [range_key, symbol], '_drawn': now, '_panels': [series_names for _, series_names, _ in panels]}
+        for title, series_names, y_range in panels:
+            outputs += [_history_figure(title, series_names, start, y_range), dash.no_update]
+            for name in series_names:
+                cursor[name] = history.latest_ts(name)
+    else:
+        # Interval tick: append only what arrived since the client's last timestamp, to the traces drawn at redraw
+        for series_names in cursor['_panels']:
+            outputs += [dash.no_update, _history_extension(series_names, cursor)]
+    return outputs + [cursor]
+
 if __name__ == '__main__':
     app.run_server(debug=False, host=config['dashboard']['host'], port=config['dashboard']['port'])
\ No newline at end of file
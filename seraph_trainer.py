@@ -11,7 +11,8 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
 
-from modules.technical_analyzer import TechnicalAnalyzer
+from modules.technical_analyzer import TechnicalAnalyzer, FEATURE_COLUMNS
+from modules.feature_cache import FeatureCache, index_to_ns
 
 class SeraphTrainer:
     """
@@ -23,6 +24,7 @@ class SeraphTrainer:
         self.ai_name = config["system_identity"]["name"]
         logging.info(f"{self.ai_name} Trainer initialized.")
         self.tech_analyzer = TechnicalAnalyzer(config)
+        self.feature_cache = FeatureCache(config, self.tech_analyzer)
 
     def _connect_mt5(self):
         # ... [Same connection logic as other modules] ...
@@ -60,22 +62,22 @@ class SeraphTrainer:
 
         df = pd.DataFrame(rates); df['time'] = pd.to_datetime(df['time'], unit='s'); df.set_index('time', inplace=True)
         
-        # 2. Engineer Features
-        df = self.tech_analyzer.calculate_features(df)
-        df.dropna(inplace=True)
+        # 2. Engineer Features (read straight from the cache's memory-mapped matrix; closed bars only)
+        times, features = self.feature_cache.get_matrix(symbol, df, FEATURE_COLUMNS)
+        closes = df['close'].to_numpy()[np.searchsorted(index_to_ns(df.index), times)]
         
         # 3. Create Sequences and Save Assets
-        feature_columns = ['close', 'high', 'low', 'open', 'tick_volume', 'sma_20', 'sma_50', 'ema_12', 'ema_26', 'macd', 'macd_signal', 'rsi', 'bb_upper', 'bb_lower', 'fvg']
-        available_features = [col for col in feature_columns if col in df.columns]
+        available_features = list(FEATURE_COLUMNS)
         
         scaler = MinMaxScaler(feature_range=(0, 1))
-        scaled_data = scaler.fit_transform(df[available_features])
+        # Fitted with column names so live analysis can transform a DataFrame without warnings
+        scaled_data = scaler.fit_transform(pd.DataFrame(features, columns=available_features, copy=False))
         
         lookback = self.config["model_architecture"]["lookback_period"]
         X, y = [], []
         for i in range(lookback, len(scaled_data)):
             X.append(scaled_data[i-lookback:i, :])
-            y.append(1 if df['close'].iloc[i] > df['close'].iloc[i-1] else 0)
+            y.append(1 if closes[i] > closes[i-1] else 0)
         X, y = np.array(X), np.array(y)
         
         # 4. Define Dynamic Paths for Saving